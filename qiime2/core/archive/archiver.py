@@ -7,18 +7,34 @@
 # ----------------------------------------------------------------------------
 
 import collections
+import typing
 import uuid as _uuid
 import pathlib
 import weakref
 import zipfile
+import zlib
 import importlib
 import os
 import io
+import re
+import stat
+import struct
+import threading
+import concurrent.futures
 
 import qiime2
 import qiime2.core.cite as cite
 
-from qiime2.core.util import md5sum_directory, from_checksum_format, is_uuid4
+from qiime2.core.util import md5sum_directory, from_checksum_format
+
+# Equivalent to qiime2.core.util.is_uuid4, without constructing a UUID
+_UUID4_RE = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}\Z')
+
+_VERSION_RE = re.compile(
+    rb'[ \t]*QIIME 2[ \t]*\r?\n'
+    rb'archive:[ \t]*(\S+)[ \t]*\r?\n'
+    rb'framework:[ \t]*(\S+)[ \t]*(?:\r?\n)?\Z')
 
 _VERSION_TEMPLATE = """\
 QIIME 2
@@ -26,12 +42,39 @@ archive: %s
 framework: %s
 """
 
-ArchiveRecord = collections.namedtuple(
-    'ArchiveRecord', ['root', 'version_fp', 'uuid', 'version',
-                      'framework_version'])
 
-ChecksumDiff = collections.namedtuple(
-    'ChecksumDiff', ['added', 'removed', 'changed'])
+class ArchiveRecord(typing.NamedTuple):
+    root: pathlib.Path
+    version_fp: pathlib.Path
+    uuid: typing.Union[str, _uuid.UUID]
+    version: str
+    framework_version: str
+
+
+class ChecksumDiff(typing.NamedTuple):
+    added: dict
+    removed: dict
+    changed: dict
+
+
+# Results of Archiver.peek, keyed on the file's identity and stat so that
+# rewriting the file invalidates its entry. Least recently used are evicted.
+_PEEK_CACHE = collections.OrderedDict()
+_PEEK_CACHE_SIZE = 128
+_PEEK_CACHE_LOCK = threading.Lock()
+
+
+def _stat_key(path):
+    """Identify the current contents of the file at `path`.
+
+    Returns None for anything but a regular file, as a directory's stat does
+    not change when the files inside of it do.
+    """
+    st = os.stat(str(path))
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return (os.path.abspath(str(path)), st.st_ino, st.st_mtime_ns,
+            st.st_size)
 
 
 class _Archive:
@@ -66,6 +109,8 @@ class _Archive:
 
     """
     VERSION_FILE = 'VERSION'
+    __slots__ = ('path', 'uuid', 'version', 'framework_version', '_zf',
+                 '_names', '__weakref__')
 
     @classmethod
     def is_archive_type(cls, filepath):
@@ -87,6 +132,8 @@ class _Archive:
 
     def __init__(self, path):
         self.path = path
+        self._zf = None
+        self._names = None
 
         self.uuid = self._get_uuid()
         self.version, self.framework_version = self._get_versions()
@@ -96,18 +143,19 @@ class _Archive:
             raise TypeError("%s does not exist or is not a filepath."
                             % self.path)
 
-        roots = set()
+        roots = []
         for relpath in self.relative_iterdir():
-            if not relpath.startswith('.'):
-                roots.add(relpath)
+            if relpath.startswith('.') or relpath in roots:
+                continue
+            roots.append(relpath)
+            if len(roots) > 1:
+                raise ValueError("Archive has multiple root directories: %r"
+                                 % roots)
 
         if len(roots) == 0:
             raise ValueError("Archive does not have a visible root directory.")
-        if len(roots) > 1:
-            raise ValueError("Archive has multiple root directories: %r"
-                             % roots)
-        uuid = roots.pop()
-        if not is_uuid4(uuid):
+        uuid = roots[0]
+        if not _UUID4_RE.match(uuid):
             raise ValueError(
                 "Archive root directory name %r is not a valid version 4 "
                 "UUID." % uuid)
@@ -115,19 +163,20 @@ class _Archive:
 
     def _get_versions(self):
         try:
-            with self.open(self.VERSION_FILE) as fh:
-                header, version_line, framework_version_line, eof = \
-                    fh.read().split('\n')
-            if header.strip() != 'QIIME 2':
+            match = _VERSION_RE.match(self._read_bytes(self.VERSION_FILE))
+            if match is None:
                 raise Exception()  # GOTO except Exception
-            version = version_line.split(':')[1].strip()
-            framework_version = framework_version_line.split(':')[1].strip()
-            return version, framework_version
+            version, framework_version = match.groups()
+            return version.decode('ascii'), framework_version.decode('ascii')
         except Exception:
             # TODO: make a "better" parser which isn't just a catch-all
             raise ValueError("Archive does not contain a correctly formatted"
                              " VERSION file.")
 
+    def _read_bytes(self, relpath):
+        with self.open(relpath) as fh:
+            return fh.read().encode('utf-8')
+
     def relative_iterdir(self, relpath='.'):
         raise NotImplementedError
 
@@ -140,49 +189,227 @@ class _Archive:
 
 class _ZipArchive(_Archive):
     """A specific variant of Archive which deals with ZIP64 files."""
+    __slots__ = ('_uuid_names',)
+    _BUFFER_SIZE = 256 * 1024
+    _COMPRESS_LEVEL = 6
+    # Files larger than this are streamed through ZipFile.write on the calling
+    # thread rather than being compressed into memory by a worker.
+    _IN_MEMORY_SIZE_LIMIT = 32 * 1024 * 1024
+    # Upper bound on the source bytes being compressed in memory at once
+    _IN_FLIGHT_SIZE_LIMIT = 128 * 1024 * 1024
+    # Extraction is only spread over threads beyond either of these
+    _PARALLEL_MIN_ENTRIES = 256
+    _PARALLEL_MIN_SIZE = 16 * 1024 * 1024
 
     @classmethod
     def is_archive_type(cls, path):
         return zipfile.is_zipfile(str(path))
 
+    def __init__(self, path):
+        super().__init__(path)
+
+        root = str(self.uuid)
+        prefix = root + '/'
+        self._uuid_names = [name for name in self._namelist()
+                            if name.startswith(prefix) or name == root]
+
     @classmethod
     def save(cls, source, destination):
-        parent_dir = os.path.split(source)[0]
+        entries = [(abspath, cls._as_zip_path(arcname), size)
+                   for abspath, arcname, size in cls._iter_files(str(source))]
+
+        n_workers = os.cpu_count() or 1
         with zipfile.ZipFile(str(destination), mode='w',
                              compression=zipfile.ZIP_DEFLATED,
-                             allowZip64=True) as zf:
-            for root, dirs, files in os.walk(str(source)):
-                # Prune hidden directories from traversal. Strategy modified
-                # from http://stackoverflow.com/a/13454267/3776794
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                             allowZip64=True) as zf, \
+                concurrent.futures.ThreadPoolExecutor(n_workers) as executor:
+            # Entries are compressed concurrently but written in order. Only
+            # a bounded window, by both count and size, is kept in flight so
+            # that memory stays flat. Compressed output is effectively never
+            # larger than its source, so source sizes bound the buffers.
+            pending = collections.deque()
+            in_flight = 0
+            for abspath, arcname, size in entries:
+                if size > cls._IN_MEMORY_SIZE_LIMIT:
+                    size = 0
+                    entry = (abspath, arcname)
+                else:
+                    entry = executor.submit(
+                        cls._compress_entry, abspath, arcname)
+                pending.append((entry, size))
+                in_flight += size
+
+                while pending and (len(pending) > 2 * n_workers
+                                   or in_flight > cls._IN_FLIGHT_SIZE_LIMIT):
+                    in_flight -= cls._write_entry(zf, *pending.popleft())
+
+            while pending:
+                cls._write_entry(zf, *pending.popleft())
 
-                for file in files:
-                    if file.startswith('.'):
-                        continue
+    @classmethod
+    def _iter_files(cls, root):
+        """Yield (abspath, arcname, size) for every non-hidden file beneath
+        `root`, with arcname relative to the parent of `root`.
+        """
+        prefix_len = len(os.path.split(root)[0])
+        for abspath, size in cls._scan_files(root):
+            yield abspath, abspath[prefix_len:].lstrip(os.sep), size
 
-                    abspath = pathlib.Path(root) / file
-                    relpath = abspath.relative_to(parent_dir)
+    @classmethod
+    def _scan_files(cls, path):
+        # Like os.walk: hidden entries are pruned, symlinked directories are
+        # not followed, and a directory's files come before its subdirectories.
+        subdirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    yield entry.path, entry.stat().st_size
+
+        for subdir in subdirs:
+            yield from cls._scan_files(subdir)
 
-                    zf.write(str(abspath), arcname=cls._as_zip_path(relpath))
+    @classmethod
+    def _compress_entry(cls, abspath, arcname):
+        zinfo = zipfile.ZipInfo.from_file(abspath, arcname)
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+
+        compressor = zlib.compressobj(cls._COMPRESS_LEVEL, zlib.DEFLATED,
+                                      -zlib.MAX_WBITS)
+        crc = 0
+        size = 0
+        chunks = []
+        with open(abspath, 'rb') as fh:
+            while True:
+                chunk = fh.read(cls._BUFFER_SIZE)
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                chunks.append(compressor.compress(chunk))
+        chunks.append(compressor.flush())
+        data = b''.join(chunks)
+
+        zinfo.CRC = crc
+        zinfo.file_size = size
+        zinfo.compress_size = len(data)
+        return zinfo, data
+
+    @classmethod
+    def _write_entry(cls, zf, entry, size):
+        """Write a pending entry and return its `size`."""
+        if isinstance(entry, concurrent.futures.Future):
+            zinfo, data = entry.result()
+            cls._write_raw(zf, zinfo, (data,))
+        else:
+            abspath, arcname = entry
+            zf.write(abspath, arcname=arcname)
+        return size
+
+    @classmethod
+    def _write_raw(cls, zf, zinfo, chunks):
+        """Write an entry whose data is already compressed.
+
+        `zinfo` must describe the compressed `chunks` completely (CRC and
+        both sizes). This is the bookkeeping ZipFile.write does around its own
+        compressor; we only skip the compression which already happened.
+        """
+        # Mirrors ZipFile._open_to_write
+        if zf._writing:
+            raise ValueError("Can't write to the ZIP file while there is "
+                             "another write handle open on it. "
+                             "Close the first handle before opening another.")
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+        zf.fp.write(zinfo.FileHeader(zip64))
+        for chunk in chunks:
+            zf.fp.write(chunk)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+
+    def copy(self, destination):
+        """Write the entries under the archive root to `destination` without
+        decompressing and recompressing them. Hidden entries are skipped just
+        as they are by `save`.
+        """
+        src = self._zipfile()
+        with zipfile.ZipFile(str(destination), mode='w',
+                             allowZip64=True) as zf:
+            for name in self._uuid_names:
+                if name.endswith('/') or any(
+                        part.startswith('.') for part in name.split('/')):
+                    continue
+
+                info = src.getinfo(name)
+                zinfo = zipfile.ZipInfo(name, info.date_time)
+                zinfo.compress_type = info.compress_type
+                zinfo.create_system = info.create_system
+                zinfo.external_attr = info.external_attr
+                # Sizes are known up front, so no data descriptor follows.
+                zinfo.flag_bits = info.flag_bits & ~0x08
+                zinfo.CRC = info.CRC
+                zinfo.file_size = info.file_size
+                zinfo.compress_size = info.compress_size
+                self._write_raw(zf, zinfo, self._iter_raw(src, info))
+
+    @classmethod
+    def _iter_raw(cls, zf, info):
+        # Positional reads leave the file offset alone, so this can't race a
+        # ZipExtFile reading from the same cached handle.
+        fd = zf.fp.fileno()
+        offset = cls._data_offset(zf, info)
+        end = offset + info.compress_size
+        while offset < end:
+            chunk = os.pread(fd, min(end - offset, cls._BUFFER_SIZE), offset)
+            if not chunk:
+                raise zipfile.BadZipFile(
+                    "Truncated data for entry %r" % info.filename)
+            offset += len(chunk)
+            yield chunk
+
+    @classmethod
+    def _data_offset(cls, zf, info):
+        """Return the offset of `info`'s compressed data in `zf`."""
+        fheader = os.pread(zf.fp.fileno(), zipfile.sizeFileHeader,
+                           info.header_offset)
+        if len(fheader) != zipfile.sizeFileHeader:
+            raise zipfile.BadZipFile("Truncated file header")
+        fheader = struct.unpack(zipfile.structFileHeader, fheader)
+        if fheader[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(
+                "Bad magic number for file header of %r" % info.filename)
+        return (info.header_offset + zipfile.sizeFileHeader
+                + fheader[zipfile._FH_FILENAME_LENGTH]
+                + fheader[zipfile._FH_EXTRA_FIELD_LENGTH])
 
     def relative_iterdir(self, relpath=''):
         relpath = self._as_zip_path(relpath)
         seen = set()
-        with zipfile.ZipFile(str(self.path), mode='r') as zf:
-            for name in zf.namelist():
-                if name.startswith(relpath):
-                    parts = pathlib.PurePosixPath(name).parts
-                    if len(parts) > 0:
-                        result = parts[0]
-                        if result not in seen:
-                            seen.add(result)
-                            yield result
+        for name in self._namelist():
+            if name.startswith(relpath):
+                result = name.split('/', 1)[0]
+                if result and result not in seen:
+                    seen.add(result)
+                    yield result
 
     def open(self, relpath):
-        relpath = pathlib.Path(str(self.uuid)) / relpath
-        with zipfile.ZipFile(str(self.path), mode='r') as zf:
-            # The filehandle will still work even when `zf` is "closed"
-            return io.TextIOWrapper(zf.open(self._as_zip_path(relpath)))
+        return io.TextIOWrapper(
+            self._zipfile().open(self._member_name(relpath)))
+
+    def _read_bytes(self, relpath):
+        return self._zipfile().read(self._member_name(relpath))
+
+    def _member_name(self, relpath):
+        return str(self.uuid) + '/' + str(relpath).replace(os.sep, '/')
 
     def mount(self, filepath):
         # TODO: use FUSE/MacFUSE/Dokany bindings (many Python bindings are
@@ -204,28 +431,116 @@ class _ZipArchive(_Archive):
     def extract(self, filepath):
         filepath = pathlib.Path(filepath)
         assert os.path.basename(filepath) == str(self.uuid)
-        with zipfile.ZipFile(str(self.path), mode='r') as zf:
-            for name in zf.namelist():
-                if name.startswith(str(self.uuid)):
-                    # extract removes `..` components, so as long as we extract
-                    # into `filepath`, the path won't go backwards.
-                    zf.extract(name, path=str(filepath.parent))
+        dest = str(filepath.parent)
+        names = self._uuid_names
+
+        # Create every containing directory up front so concurrent workers
+        # never race each other to create the same directory.
+        for name in names:
+            target = self._target_path(dest, name)
+            if not name.endswith('/'):
+                target = os.path.dirname(target)
+            os.makedirs(target, exist_ok=True)
+
+        # Every worker re-reads the central directory, which costs more than
+        # it saves unless there is a fair amount of data to extract.
+        zf = self._zipfile()
+        total_size = sum(zf.getinfo(name).file_size for name in names)
+        n_workers = min(os.cpu_count() or 1, len(names))
+        if n_workers <= 1 or (len(names) < self._PARALLEL_MIN_ENTRIES
+                              and total_size < self._PARALLEL_MIN_SIZE):
+            self._extract_names(zf, names, dest)
+        else:
+            # ZipFile objects are not safe to share between threads, so every
+            # worker reads its shard of entries through its own handle.
+            shards = [names[i::n_workers] for i in range(n_workers)]
+            with concurrent.futures.ThreadPoolExecutor(n_workers) as executor:
+                futures = [executor.submit(self._extract_shard, shard, dest)
+                           for shard in shards]
+                for future in futures:
+                    future.result()
 
         return filepath
 
+    def _extract_shard(self, names, dest):
+        with zipfile.ZipFile(str(self.path), mode='r') as zf:
+            self._extract_names(zf, names, dest)
+
+    @classmethod
+    def _extract_names(cls, zf, names, dest):
+        # One buffer per call, which is to say one per worker thread.
+        buf = bytearray(cls._BUFFER_SIZE)
+        for name in names:
+            cls._extract_one(zf, name, dest, buf)
+
+    @classmethod
+    def _extract_one(cls, zf, name, dest, buf):
+        """Extract a single entry into `dest` through `buf`.
+
+        Containing directories are expected to exist already.
+        """
+        target = cls._target_path(dest, name)
+        if name.endswith('/'):
+            return target
+
+        view = memoryview(buf)
+        with zf.open(name) as src, open(target, 'wb') as dst:
+            while True:
+                n = src.readinto(view)
+                if not n:
+                    break
+                dst.write(view[:n])
+
+        return target
+
+    @classmethod
+    def _target_path(cls, dest, name):
+        # Mirrors zipfile.ZipFile._extract_member: drives, absolute paths and
+        # `.`/`..` components are dropped, so as long as we extract into
+        # `dest`, the path won't go backwards.
+        arcname = name.replace('/', os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        arcname = os.path.sep.join(
+            part for part in arcname.split(os.path.sep)
+            if part not in ('', os.path.curdir, os.path.pardir))
+        if os.path.sep == '\\':
+            arcname = zipfile.ZipFile._sanitize_windows_name(
+                arcname, os.path.sep)
+        return os.path.normpath(os.path.join(dest, arcname))
+
+    def _zipfile(self):
+        # Reading the central directory is linear in the number of entries,
+        # so keep a single handle open for the lifetime of this archive
+        # instead of re-parsing it on every call.
+        if self._zf is None:
+            self._zf = zipfile.ZipFile(str(self.path), mode='r')
+            self._names = self._zf.namelist()
+            weakref.finalize(self, self._zf.close)
+        return self._zf
+
+    def _namelist(self):
+        self._zipfile()
+        return self._names
+
     @classmethod
     def _as_zip_path(self, path):
-        path = str(pathlib.PurePosixPath(path))
+        # Plain strings are already normalized by our callers, so skip the
+        # Path round trip for them
+        if not isinstance(path, str):
+            path = str(pathlib.PurePosixPath(path))
         # zip files don't work well with '.' which is the identity of a Path
         # obj, so just convert to empty string which is basically the identity
         # of a zip's entry
         if path == '.':
             path = ''
-        return path
+        return path.replace(os.sep, '/')
 
 
 class _NoOpArchive(_Archive):
     """For dealing with unzipped artifacts"""
+    __slots__ = ()
 
     @classmethod
     def is_archive_type(cls, path):
@@ -238,15 +553,18 @@ class _NoOpArchive(_Archive):
         return os.path.basename(self.path)
 
     def relative_iterdir(self, relpath=''):
-        seen = set()
-        for name in os.listdir(str(self.path)):
-            if name.startswith(relpath) and name not in seen:
-                seen.add(name)
-                yield name
+        with os.scandir(str(self.path)) as it:
+            for entry in it:
+                if entry.name.startswith(relpath):
+                    yield entry.name
 
     def open(self, relpath):
         return open(os.path.join(self.path, relpath))
 
+    def _read_bytes(self, relpath):
+        with open(os.path.join(self.path, relpath), 'rb') as fh:
+            return fh.read()
+
     def mount(self, path):
         root = path
         return ArchiveRecord(root, root / self.VERSION_FILE,
@@ -255,6 +573,7 @@ class _NoOpArchive(_Archive):
 
 class ArchiveCheck(_Archive):
     """Used by the Jupyter handlers"""
+    __slots__ = ()
 
     # TODO: make this part of the archiver API at some point
     def open(self, relpath):
@@ -262,8 +581,9 @@ class ArchiveCheck(_Archive):
         return open(abspath, 'r')
 
     def relative_iterdir(self, relpath='.'):
-        for p in pathlib.Path(self.path).iterdir():
-            yield str(p.relative_to(self.path))
+        with os.scandir(str(self.path)) as it:
+            for entry in it:
+                yield entry.name
 
     def _get_uuid(self):
         return os.path.basename(self.path)
@@ -271,7 +591,10 @@ class ArchiveCheck(_Archive):
 
 class Archiver:
     CURRENT_FORMAT_VERSION = '5'
-    _FORMAT_REGISTRY = {
+    __slots__ = ('path', 'process_alias', '_fmt', '_destructor', 'uuid',
+                 'type', 'format', 'data_dir', 'root_dir', 'provenance_dir',
+                 '_source', '__weakref__')
+    _FORMAT_MODULES = {
         # NOTE: add more archive formats as things change
         '0': 'qiime2.core.archive.format.v0:ArchiveFormat',
         '1': 'qiime2.core.archive.format.v1:ArchiveFormat',
@@ -280,6 +603,8 @@ class Archiver:
         '4': 'qiime2.core.archive.format.v4:ArchiveFormat',
         '5': 'qiime2.core.archive.format.v5:ArchiveFormat'
     }
+    # Format classes are imported on first use by get_format_class
+    _FORMAT_REGISTRY = dict.fromkeys(_FORMAT_MODULES)
 
     @classmethod
     def _make_temp_path(cls, uuid):
@@ -302,10 +627,14 @@ class Archiver:
     @classmethod
     def get_format_class(cls, version):
         try:
-            imp, fmt_cls = cls._FORMAT_REGISTRY[version].split(':')
+            format_class = cls._FORMAT_REGISTRY[version]
         except KeyError:
             return None
-        return getattr(importlib.import_module(imp), fmt_cls)
+        if format_class is None:
+            imp, fmt_cls = cls._FORMAT_MODULES[version].split(':')
+            format_class = getattr(importlib.import_module(imp), fmt_cls)
+            cls._FORMAT_REGISTRY[version] = format_class
+        return format_class
 
     @classmethod
     def get_archive(cls, filepath):
@@ -332,6 +661,16 @@ class Archiver:
 
     @classmethod
     def peek(cls, filepath):
+        try:
+            key = _stat_key(filepath)
+        except OSError:
+            key = None
+        if key is not None:
+            with _PEEK_CACHE_LOCK:
+                if key in _PEEK_CACHE:
+                    _PEEK_CACHE.move_to_end(key)
+                    return _PEEK_CACHE[key]
+
         archive = cls.get_archive(filepath)
         Format = cls.get_format_class(archive.version)
         if Format is None:
@@ -341,7 +680,14 @@ class Archiver:
         # e.g. a new format has a new property that peek should describe. We
         # add some compatability code here to return a default for that
         # property on older formats.
-        return Format.load_metadata(archive)
+        metadata = Format.load_metadata(archive)
+
+        if key is not None:
+            with _PEEK_CACHE_LOCK:
+                _PEEK_CACHE[key] = metadata
+                if len(_PEEK_CACHE) > _PEEK_CACHE_SIZE:
+                    _PEEK_CACHE.popitem(last=False)
+        return metadata
 
     @classmethod
     def extract(cls, filepath, dest):
@@ -357,6 +703,7 @@ class Archiver:
     def load(cls, filepath):
         archive = cls.get_archive(filepath)
         path, cache = cls._make_temp_path(archive.uuid)
+        process_alias = None
 
         try:
             Format = cls.get_format_class(archive.version)
@@ -370,12 +717,20 @@ class Archiver:
                 data_path, data_path / archive.VERSION_FILE, archive.uuid,
                 archive.version, archive.framework_version)
             ref = cls(data_path, process_alias, Format(rec), cache)
+            if isinstance(archive, _ZipArchive):
+                # Only used to copy entries verbatim on save, so a zip that
+                # has already gone away just means saving the regular way.
+                try:
+                    key = _stat_key(archive.path)
+                except OSError:
+                    key = None
+                ref._source = (archive.path, key)
             return ref
         # We really just want to kill these paths if anything at all goes wrong
         # Exceptions including keyboard interrupts are re-raised
         except:  # noqa: E722
             cls._destroy_temp_path(archive.uuid)
-            if 'process_alias' in vars():
+            if process_alias is not None:
                 cls._destroy_temp_path(process_alias)
             raise
 
@@ -399,6 +754,7 @@ class Archiver:
     def from_data(cls, type, format, data_initializer, provenance_capture):
         uuid = _uuid.uuid4()
         path, cache = cls._make_temp_path(uuid)
+        process_alias = None
 
         try:
             rec = _Archive.setup(uuid, path, cls.CURRENT_FORMAT_VERSION,
@@ -418,7 +774,7 @@ class Archiver:
         # Exceptions including keyboard interrupts are re-raised
         except:  # noqa: E722
             cls._destroy_temp_path(uuid)
-            if 'process_alias' in vars():
+            if process_alias is not None:
                 cls._destroy_temp_path(process_alias)
             raise
 
@@ -426,39 +782,69 @@ class Archiver:
         self.path = path
         self.process_alias = process_alias
         self._fmt = fmt
+        # These are fixed once the format has been loaded
+        self.uuid = fmt.uuid
+        self.type = fmt.type
+        self.format = fmt.format
+        self.data_dir = fmt.data_dir
+        self.root_dir = fmt.path
+        self.provenance_dir = getattr(fmt, 'provenance_dir', None)
+        # The zip this archive was loaded from, with its stat key at the time
+        self._source = None
         self._destructor = weakref.finalize(self, cache._deallocate,
                                             str(self.process_alias))
+        # The cache removes this process's entire pool when the interpreter
+        # exits, so there is no need to run every archiver's finalizer then.
+        self._destructor.atexit = False
 
     @property
-    def uuid(self):
-        return self._fmt.uuid
-
-    @property
-    def type(self):
-        return self._fmt.type
-
-    @property
-    def format(self):
-        return self._fmt.format
+    def citations(self):
+        return getattr(self._fmt, 'citations', cite.Citations())
 
-    @property
-    def data_dir(self):
-        return self._fmt.data_dir
+    def save(self, filepath):
+        source = self._pristine_source(filepath)
+        if source is not None:
+            source.copy(filepath)
+        else:
+            _ZipArchive.save(self.path, filepath)
 
-    @property
-    def root_dir(self):
-        return self._fmt.path
+    def _pristine_source(self, filepath):
+        """Return the zip this archive was loaded from if its entries can be
+        copied verbatim into `filepath`, otherwise None.
 
-    @property
-    def provenance_dir(self):
-        return getattr(self._fmt, 'provenance_dir', None)
+        This is only an optimization, so any problem found while checking
+        just means the archive is saved the regular way.
+        """
+        if self._source is None:
+            return None
+        if not isinstance(self._fmt, self.get_format_class('5')):
+            return None
 
-    @property
-    def citations(self):
-        return getattr(self._fmt, 'citations', cite.Citations())
+        path, key = self._source
+        try:
+            if key is None or _stat_key(path) != key:
+                return None
+            if os.path.exists(filepath) and os.path.samefile(filepath, path):
+                return None
+
+            diff = self.validate_checksums()
+            if diff.added or diff.removed or diff.changed:
+                return None
+
+            source = _ZipArchive(path)
+            if source.uuid != str(self.uuid):
+                return None
+            with source.open(self._fmt.CHECKSUM_FILE) as fh:
+                source_checksums = fh.read()
+            with open(self.root_dir / self._fmt.CHECKSUM_FILE) as fh:
+                if fh.read() != source_checksums:
+                    return None
+        # KeyError is a member missing from the zip, ValueError is an archive
+        # which no longer parses
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
 
-    def save(self, filepath):
-        _ZipArchive.save(self.path, filepath)
+        return source
 
     def validate_checksums(self):
         if not isinstance(self._fmt, self.get_format_class('5')):
@@ -467,14 +853,19 @@ class Archiver:
         obs = dict(x for x in md5sum_directory(str(self.root_dir)).items()
                    if x[0] != self._fmt.CHECKSUM_FILE)
         with open(self.root_dir / self._fmt.CHECKSUM_FILE) as fh:
-            exp = dict(from_checksum_format(line) for line in
-                       fh.readlines())
-        obs_keys = set(obs)
-        exp_keys = set(exp)
-
-        added = {x: obs[x] for x in obs_keys - exp_keys}
-        removed = {x: exp[x] for x in exp_keys - obs_keys}
-        changed = {x: (exp[x], obs[x]) for x in exp_keys & obs_keys
-                   if exp[x] != obs[x]}
+            exp = dict(from_checksum_format(line) for line in fh)
+
+        added = {}
+        removed = {}
+        changed = {}
+        for key, exp_value in exp.items():
+            obs_value = obs.get(key)
+            if obs_value is None:
+                removed[key] = exp_value
+            elif obs_value != exp_value:
+                changed[key] = (exp_value, obs_value)
+        for key, obs_value in obs.items():
+            if key not in exp:
+                added[key] = obs_value
 
         return ChecksumDiff(added=added, removed=removed, changed=changed)
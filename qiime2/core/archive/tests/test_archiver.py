@@ -6,9 +6,13 @@
 # The full license is in the file LICENSE, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import concurrent.futures
+import copy
 import os
+import pickle
 import tempfile
 import unittest
+import unittest.mock as mock
 import uuid
 import zipfile
 import pathlib
@@ -46,6 +50,27 @@ class TestArchiver(unittest.TestCase, ArchiveTestingMixin):
     def tearDown(self):
         self.temp_dir.cleanup()
 
+    def _make_archiver(self, files):
+        """Create an archiver whose data directory holds `files`, a mapping
+        of relative paths to text content.
+        """
+        def data_initializer(data_dir):
+            for relpath, content in files.items():
+                fp = os.path.join(str(data_dir), relpath)
+                os.makedirs(os.path.dirname(fp), exist_ok=True)
+                with open(fp, 'w') as fh:
+                    fh.write(content)
+
+        return Archiver.from_data(
+            IntSequence1, IntSequenceDirectoryFormat,
+            data_initializer=data_initializer,
+            provenance_capture=ImportProvenanceCapture())
+
+    def _write_zip(self, fp, root_dir, contents, compression):
+        with zipfile.ZipFile(fp, mode='w', compression=compression) as zf:
+            for name, content in contents.items():
+                zf.writestr('%s/%s' % (root_dir, name), content)
+
     def test_save_invalid_filepath(self):
         # Empty filepath.
         with self.assertRaisesRegex(FileNotFoundError, 'No such file'):
@@ -118,6 +143,25 @@ class TestArchiver(unittest.TestCase, ArchiveTestingMixin):
 
         self.assertArchiveMembers(fp, root_dir, expected)
 
+    def test_save_archive_contents(self):
+        archiver = self._make_archiver(
+            {'file%d.txt' % i: '%d\n' % i * 1000 * i for i in range(10)})
+
+        fp = os.path.join(self.temp_dir.name, 'archive.zip')
+        # Force the larger files down the serial path as well, and keep no
+        # more than about one file's worth of data in flight.
+        with mock.patch.multiple(_ZipArchive, _IN_MEMORY_SIZE_LIMIT=5000,
+                                 _IN_FLIGHT_SIZE_LIMIT=4000):
+            archiver.save(fp)
+
+        with zipfile.ZipFile(fp, mode='r') as zf:
+            self.assertIsNone(zf.testzip())
+            for i in range(10):
+                info = zf.getinfo('%s/data/file%d.txt' % (archiver.uuid, i))
+                self.assertEqual(info.compress_type, zipfile.ZIP_DEFLATED)
+                self.assertEqual(zf.read(info),
+                                 ('%d\n' % i * 1000 * i).encode())
+
     def test_load_archive(self):
         fp = os.path.join(self.temp_dir.name, 'archive.zip')
         self.archiver.save(fp)
@@ -131,6 +175,63 @@ class TestArchiver(unittest.TestCase, ArchiveTestingMixin):
                           for p in archiver.data_dir.iterdir()},
                          {'ints.txt'})
 
+    def test_extract_nested_archive_members(self):
+        archiver = self._make_archiver(
+            {os.path.join('dir%d' % (i % 5), 'file%d.txt' % i): '%d\n' % i
+             for i in range(25)})
+
+        fp = os.path.join(self.temp_dir.name, 'archive.zip')
+        archiver.save(fp)
+
+        # A small archive is extracted serially through the cached handle,
+        # so force the thread pool as well.
+        serial = mock.patch.object(concurrent.futures, 'ThreadPoolExecutor',
+                                   side_effect=AssertionError('threaded'))
+        threaded = mock.patch.multiple(_ZipArchive, _PARALLEL_MIN_ENTRIES=0,
+                                       _PARALLEL_MIN_SIZE=0)
+        for name, context in (('serial', serial), ('threaded', threaded)):
+            output_dir = os.path.join(self.temp_dir.name, name)
+            with context, mock.patch.object(os, 'cpu_count', return_value=4):
+                root_dir = Archiver.extract(fp, output_dir)
+
+            self.assertEqual(root_dir,
+                             os.path.join(output_dir, str(archiver.uuid)))
+            for i in range(25):
+                path = os.path.join(root_dir, 'data', 'dir%d' % (i % 5),
+                                    'file%d.txt' % i)
+                with open(path) as fh:
+                    self.assertEqual(fh.read(), '%d\n' % i)
+
+            diff = Archiver.load(root_dir).validate_checksums()
+            self.assertEqual(diff.added, {})
+            self.assertEqual(diff.removed, {})
+            self.assertEqual(diff.changed, {})
+
+    def test_extract_target_path_stays_in_destination(self):
+        dest = self.temp_dir.name
+        for name in ('../../evil.txt', '/evil.txt', './a/../evil.txt',
+                     'a//evil.txt'):
+            target = _ZipArchive._target_path(dest, name)
+            self.assertEqual(os.path.commonpath([dest, target]), dest)
+            self.assertEqual(os.path.basename(target), 'evil.txt')
+
+    def test_peek_cached_until_file_changes(self):
+        fp = os.path.join(self.temp_dir.name, 'archive.zip')
+        self.archiver.save(fp)
+
+        metadata = Archiver.peek(fp)
+        self.assertEqual(metadata[0], str(self.archiver.uuid))
+
+        with mock.patch.object(Archiver, 'get_archive') as get_archive:
+            self.assertEqual(Archiver.peek(fp), metadata)
+        get_archive.assert_not_called()
+
+        other = self._make_archiver({'ints.txt': '4\n'})
+        os.remove(fp)
+        other.save(fp)
+
+        self.assertEqual(Archiver.peek(fp)[0], str(other.uuid))
+
     def test_load_ignores_root_dotfiles(self):
         fp = os.path.join(self.temp_dir.name, 'archive.zip')
         self.archiver.save(fp)
@@ -177,6 +278,88 @@ class TestArchiver(unittest.TestCase, ArchiveTestingMixin):
                           for p in archiver.data_dir.iterdir()},
                          {'ints.txt'})
 
+    def test_resave_copies_pristine_archive(self):
+        fp = os.path.join(self.temp_dir.name, 'archive.zip')
+        self.archiver.save(fp)
+
+        with zipfile.ZipFile(fp, mode='a') as zf:
+            zf.writestr('.DS_Store', "The world's most beloved file\n")
+
+        archiver = Archiver.load(fp)
+        resaved_fp = os.path.join(self.temp_dir.name, 'resaved.zip')
+        with mock.patch.object(_ZipArchive, 'save') as save:
+            archiver.save(resaved_fp)
+        save.assert_not_called()
+
+        root_dir = str(self.archiver.uuid)
+        expected = {
+            'VERSION',
+            'checksums.md5',
+            'metadata.yaml',
+            'data/ints.txt',
+            'provenance/metadata.yaml',
+            'provenance/VERSION',
+            'provenance/citations.bib',
+            'provenance/action/action.yaml'
+        }
+        self.assertArchiveMembers(resaved_fp, root_dir, expected)
+
+        with zipfile.ZipFile(fp, mode='r') as src, \
+                zipfile.ZipFile(resaved_fp, mode='r') as dst:
+            self.assertIsNone(dst.testzip())
+            for name in dst.namelist():
+                self.assertEqual(dst.read(name), src.read(name))
+                self.assertEqual(dst.getinfo(name).CRC,
+                                 src.getinfo(name).CRC)
+
+    def test_resave_recompresses_modified_archive(self):
+        fp = os.path.join(self.temp_dir.name, 'archive.zip')
+        self.archiver.save(fp)
+
+        archiver = Archiver.load(fp)
+        set_permissions(archiver.root_dir, OTHER_NO_WRITE, OTHER_NO_WRITE)
+        with (archiver.root_dir / 'data' / 'ints.txt').open('w') as fh:
+            fh.write('999\n')
+
+        resaved_fp = os.path.join(self.temp_dir.name, 'resaved.zip')
+        archiver.save(resaved_fp)
+
+        with zipfile.ZipFile(resaved_fp, mode='r') as zf:
+            self.assertEqual(
+                zf.read('%s/data/ints.txt' % archiver.uuid), b'999\n')
+
+    def test_resave_without_checksums(self):
+        fp = os.path.join(self.temp_dir.name, 'archive.zip')
+        self.archiver.save(fp)
+
+        archiver = Archiver.load(fp)
+        set_permissions(archiver.root_dir, OTHER_NO_WRITE, OTHER_NO_WRITE)
+        (archiver.root_dir / 'checksums.md5').unlink()
+
+        resaved_fp = os.path.join(self.temp_dir.name, 'resaved.zip')
+        archiver.save(resaved_fp)
+
+        with zipfile.ZipFile(resaved_fp, mode='r') as zf:
+            self.assertNotIn('%s/checksums.md5' % archiver.uuid,
+                             zf.namelist())
+            self.assertEqual(
+                zf.read('%s/data/ints.txt' % archiver.uuid), b'1\n2\n3\n')
+
+    def test_load_when_source_disappears(self):
+        fp = os.path.join(self.temp_dir.name, 'archive.zip')
+        self.archiver.save(fp)
+
+        with mock.patch('qiime2.core.archive.archiver._stat_key',
+                        side_effect=FileNotFoundError(fp)):
+            archiver = Archiver.load(fp)
+        self.assertTrue((archiver.data_dir / 'ints.txt').exists())
+
+        resaved_fp = os.path.join(self.temp_dir.name, 'resaved.zip')
+        with mock.patch.object(_ZipArchive, 'copy') as copy_:
+            archiver.save(resaved_fp)
+        copy_.assert_not_called()
+        self.assertEqual(archiver.validate_checksums().changed, {})
+
     def test_load_empty_archive(self):
         fp = os.path.join(self.temp_dir.name, 'empty.zip')
 
@@ -262,6 +445,30 @@ class TestArchiver(unittest.TestCase, ArchiveTestingMixin):
                                     'root directory.*valid version 4 UUID'):
             _ZipArchive(zp)
 
+    def test_load_version_file(self):
+        root_dir = str(uuid.uuid4())
+        cases = [
+            ('QIIME 2\narchive: 5\nframework: 2023.5.0\n', ('5', '2023.5.0')),
+            ('QIIME 2\r\narchive: 5\r\nframework: 2023.5.0\r\n',
+             ('5', '2023.5.0')),
+            ('QIIME 2\narchive:5\nframework:2023.5.0', ('5', '2023.5.0')),
+            ('QIIME 2\narchive: 5\n', None),
+            ('QIIME 1\narchive: 5\nframework: 2023.5.0\n', None),
+            ('QIIME 2\narchive: 5\nframework: 2023.5.0\nextra\n', None),
+        ]
+        for i, (content, expected) in enumerate(cases):
+            fp = pathlib.Path(self.temp_dir.name) / ('version-%d.zip' % i)
+            self._write_zip(fp, root_dir, {'VERSION': content},
+                            zipfile.ZIP_STORED)
+
+            if expected is None:
+                with self.assertRaisesRegex(ValueError, 'VERSION file'):
+                    _ZipArchive(fp)
+            else:
+                archive = _ZipArchive(fp)
+                self.assertEqual(
+                    (archive.version, archive.framework_version), expected)
+
     def test_is_uuid4_valid(self):
         uuid_str = str(uuid.uuid4())
 
@@ -289,6 +496,14 @@ class TestArchiver(unittest.TestCase, ArchiveTestingMixin):
         self.assertEqual(diff.removed, {})
         self.assertEqual(diff.changed, {})
 
+    def test_checksum_diff_is_a_tuple(self):
+        diff = self.archiver.validate_checksums()
+
+        added, removed, changed = diff
+        self.assertEqual((added, removed, changed), ({}, {}, {}))
+        self.assertEqual(pickle.loads(pickle.dumps(diff)), diff)
+        self.assertEqual(copy.copy(diff), diff)
+
     def test_checksums_mismatch(self):
         # We set everything in the artifact to be read-only. This test needs to
         # mimic if the user were to somehow write it anyway, so we set write
@@ -7,6 +7,7 @@
 # ----------------------------------------------------------------------------
 
 import unittest
+import unittest.mock as mock
 import tempfile
 import pathlib
 import collections
@@ -160,6 +161,11 @@ class TestMD5Sum(unittest.TestCase):
         self.assertEqual(util.md5sum(string_path),
                          '93b048d0202e4b06b658f3aef1e764d3')
 
+    def test_file_spanning_buffers(self):
+        path = self.make_file(b'verybigfile' * (1024 * 200))
+        self.assertEqual(util.md5sum(path),
+                         '5673ae685c45d472667a1c088f4dc83f')
+
 
 class TestMD5SumDirectory(unittest.TestCase):
     # All expected results where generated via GNU coreutils md5sum
@@ -241,6 +247,17 @@ class TestMD5SumDirectory(unittest.TestCase):
                 ('beta/2', 'c81e728d9d4c2f636f067f89cc14862c'),
             ])
 
+    def test_threaded_order_matches_serial(self):
+        for i in range(20):
+            self.make_file(b'%d' % i, 'file%02d' % i)
+        expected = list(util.md5sum_directory(self.test_path).items())
+
+        with mock.patch.object(util, '_MD5_PARALLEL_MIN_SIZE', 0), \
+                mock.patch.object(util.os, 'cpu_count', return_value=4):
+            self.assertEqual(
+                list(util.md5sum_directory(self.test_path).items()),
+                expected)
+
     def test_can_use_string(self):
         nested_dir = self.test_path / 'bar'
         nested_dir.mkdir()
@@ -11,8 +11,9 @@ import warnings
 import hashlib
 import stat
 import os
-import io
 import collections
+import concurrent.futures
+import threading
 import uuid as _uuid
 
 import decorator
@@ -113,26 +114,51 @@ def duration_time(relative_delta):
         return '0 %s' % attrs[-1]
 
 
+_MD5_BUFFER_SIZE = 1024 * 1024
+_MD5_PARALLEL_MIN_SIZE = 16 * 1024 * 1024
+_md5_local = threading.local()
+
+
 def md5sum(filepath):
     md5 = hashlib.md5()
-    with open(str(filepath), mode='rb') as fh:
-        for chunk in iter(lambda: fh.read(io.DEFAULT_BUFFER_SIZE), b""):
-            md5.update(chunk)
+    # One read buffer per thread, reused across files.
+    try:
+        view = _md5_local.view
+    except AttributeError:
+        view = _md5_local.view = memoryview(bytearray(_MD5_BUFFER_SIZE))
+    with open(str(filepath), mode='rb', buffering=0) as fh:
+        while True:
+            n = fh.readinto(view)
+            if not n:
+                break
+            md5.update(view[:n])
     return md5.hexdigest()
 
 
 def md5sum_directory(directory):
     directory = str(directory)
-    sums = collections.OrderedDict()
+    paths = []
     for root, dirs, files in os.walk(directory, topdown=True):
         dirs[:] = sorted([d for d in dirs if not d[0] == '.'])
         for file in sorted(files):
             if file[0] == '.':
                 continue
 
-            path = os.path.join(root, file)
-            sums[os.path.relpath(path, start=directory)] = md5sum(path)
-    return sums
+            paths.append(os.path.join(root, file))
+
+    # hashlib only releases the GIL for large updates, so threads are worth
+    # starting only when there is enough data to keep them busy.
+    n_workers = min(os.cpu_count() or 1, len(paths))
+    if (n_workers > 1 and sum(map(os.path.getsize, paths))
+            >= _MD5_PARALLEL_MIN_SIZE):
+        with concurrent.futures.ThreadPoolExecutor(n_workers) as executor:
+            digests = list(executor.map(md5sum, paths))
+    else:
+        digests = map(md5sum, paths)
+
+    return collections.OrderedDict(
+        (os.path.relpath(path, start=directory), digest)
+        for path, digest in zip(paths, digests))
 
 
 def to_checksum_format(filepath, checksum):